@@ -88,23 +88,22 @@ def write_deployinst(deploy_array, reactor_name,
     --------
     null. creates xml file.
     """
-    prototypes = '<prototypes>\n'
-    build_times = '<build_times>\n'
-    n_build = '<n_build>\n'
-    lifetimes = '<lifetimes>\n'
+    prototypes = ['<prototypes>\n']
+    build_times = ['<build_times>\n']
+    n_build = ['<n_build>\n']
+    lifetimes = ['<lifetimes>\n']
     for time, build_num in enumerate(deploy_array):
         if build_num != 0:
-            prototypes += '\t\t<val>%s</val>\n' % reactor_name
-            build_times += '\t\t<val>%i</val>\n' % time
-            n_build += '\t\t<val>%i</val>\n' % build_num
-            lifetimes += '\t\t<val>%i</val>\n' % lifetime
-    prototypes += '</prototypes>\n'
-    build_times += '</build_times>\n'
-    n_build += '</n_build>\n'
-    lifetimes += '</lifetimes>\n'
+            prototypes.append('\t\t<val>%s</val>\n' % reactor_name)
+            build_times.append('\t\t<val>%i</val>\n' % time)
+            n_build.append('\t\t<val>%i</val>\n' % build_num)
+            lifetimes.append('\t\t<val>%i</val>\n' % lifetime)
+    prototypes.append('</prototypes>\n')
+    build_times.append('</build_times>\n')
+    n_build.append('</n_build>\n')
+    lifetimes.append('</lifetimes>\n')
 
-    outstring = '<root>\n'
-    outstring += prototypes + build_times + n_build + lifetimes
-    outstring += '</root>\n'
+    outstring = ''.join(['<root>\n'] + prototypes + build_times +
+                        n_build + lifetimes + ['</root>\n'])
     with open(filename, 'w') as f:
         f.write(outstring)
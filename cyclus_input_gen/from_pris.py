@@ -1,6 +1,8 @@
-import copy
 import sys
 import jinja2
+from jinja2 import meta, nodes
+from functools import lru_cache
+from dataclasses import dataclass
 import numpy as np
 import os
 import pandas as pd
@@ -8,6 +10,169 @@ from datetime import datetime
 from cyclus_input_gen.templates import template_collections
 from cyclus_input_gen.reactor_specs import get_data
 
+
+# statuses of reactors that are not built or are already gone
+_excluded_status = frozenset(['Review Suspended', 'Suspended Constr.', 'Deferred',
+                              'Cancelled Constr.', 'Under Review', 'Under Construction',
+                              'Permanent Shutdown'])
+
+# one environment shared by every template, so they are all compiled
+# with the same settings and never checked for reloading
+_jinja_env = jinja2.Environment(auto_reload=False)
+
+
+@lru_cache(maxsize=None)
+def _compile_template(template):
+    """Compiles a template string, once per distinct string."""
+    return _jinja_env.from_string(template)
+
+
+@lru_cache(maxsize=None)
+def _format_template(template, fields, **fixed):
+    """Renders a template string with the `fixed` values and returns the
+    result as a str.format string with a replacement field for each name
+    in `fields`.
+
+    This only reproduces the jinja render when each of the `fields` is
+    used as a plain ``{{ name }}`` output, and when `fields` and `fixed`
+    together cover every variable of the template. Any field used in an
+    expression, filter, test or control block, and any variable that is
+    neither fixed nor a field, raises a ValueError here instead of giving
+    wrong output later.
+    """
+    ast = _jinja_env.parse(template)
+    missing = meta.find_undeclared_variables(ast) - set(fields) - set(fixed)
+    if missing:
+        raise ValueError('Template variables %s are neither fixed nor fields'
+                         % sorted(missing))
+    plain = {id(node) for output in ast.find_all(nodes.Output)
+             for node in output.nodes if isinstance(node, nodes.Name)}
+    for node in ast.find_all(nodes.Name):
+        if node.name in fields and id(node) not in plain:
+            raise ValueError('Field %r is not used as a plain {{ %s }} output'
+                             % (node.name, node.name))
+
+    sentinels = {k: '\0' + k + '\0' for k in fields}
+    rendered = _compile_template(template).render(**fixed, **sentinels)
+    rendered = rendered.replace('{', '{{').replace('}', '}}')
+    for k, sentinel in sentinels.items():
+        rendered = rendered.replace(sentinel, '{' + k + '}')
+    return rendered
+
+
+# values filled in per reactor and per region with str.format
+_reactor_fields = ('country', 'reactor_name', 'assem_size', 'capacity', 'position_')
+_deployinst_fields = ('prototype', 'start_time', 'number', 'lifetime')
+_region_fields = ('country', 'country_gov', 'deployinst')
+
+
+def refine_names(names):
+    """Refines a column of reactor names, over the whole column at once.
+
+    Names that contain both '(' and ')' are cut at the first '(', and
+    ampersands are spelled out as 'and'.
+
+    Parameters
+    ----------
+    names: pandas.Series of str
+        reactor names
+
+    Returns
+    -------
+    pandas.Series of str
+        refined reactor names
+    """
+    has_parens = (names.str.contains('(', regex=False) &
+                  names.str.contains(')', regex=False))
+    names = names.where(~has_parens, names.str.split('(', n=1).str[0])
+    return names.str.replace('&', 'and', regex=False)
+
+
+# reactor template sources by template family
+_default_templates = {'pwr': template_collections.pwr_template,
+                      'mox': template_collections.mox_template,
+                      'candu': template_collections.candu_template,
+                      'smr': template_collections.smr_template}
+_cyborg_templates = dict(_default_templates,
+                         pwr=template_collections.pwr_template_cyborg,
+                         mox=template_collections.mox_template_cyborg,
+                         candu=template_collections.candu_template_cyborg)
+
+
+@dataclass(frozen=True)
+class _ReactorSpec:
+    """Specification of a reactor type. `template` names the template
+    family (a key of the template dictionary in reactor_render)."""
+    template: str
+    kg_per_assembly: float
+    assemblies_per_core: float
+    cycle_time: float
+    refuel_time: int
+    assemblies_per_batch: int
+
+
+def _lwr_spec(data):
+    """Returns the spec of a light water reactor from its reactor_specs
+    data, with the assemblies per core normalized by capacity."""
+    return _ReactorSpec(template='pwr',
+                        kg_per_assembly=data['u_mass'] / (data['elec_power'] * data['num_batch']),
+                        assemblies_per_core=data['num_batch'],
+                        cycle_time=data['cycle_length'] / 30,
+                        refuel_time=1,
+                        assemblies_per_batch=1)
+
+
+_reactor_spec_data = get_data()
+_pwr = _reactor_spec_data['pwr']
+# reactor specifications by reactor type
+# ap1000 from NRC application
+_ap1000_spec = _lwr_spec(_reactor_spec_data['ap1000'])
+_bwr_spec = _lwr_spec(_reactor_spec_data['bwr'])
+_pwr_spec = _lwr_spec(_pwr)
+
+_phwr_spec = _ReactorSpec(template='candu',
+                          kg_per_assembly=8000 / 473,
+                          assemblies_per_core=473 / 500.0,
+                          assemblies_per_batch=60,
+                          cycle_time=1,
+                          refuel_time=0)
+_candu_spec = _ReactorSpec(template='candu',
+                           kg_per_assembly=8000 / 473,
+                           assemblies_per_core=473 / 500.0,
+                           cycle_time=1,
+                           refuel_time=0,
+                           assemblies_per_batch=60)
+_epr_spec = _ReactorSpec(template='pwr',
+                         kg_per_assembly=467.0 * 216 / 4800,
+                         cycle_time=14,
+                         refuel_time=1,
+                         assemblies_per_core=3,
+                         assemblies_per_batch=1)
+_smr_spec = _ReactorSpec(template='smr',
+                         kg_per_assembly=2997.12 / 50,
+                         cycle_time=12,
+                         refuel_time=1,
+                         assemblies_per_core=3,
+                         assemblies_per_batch=1)
+# power of the generic reactors
+_pow_dict = {'AP1000': 1110,
+             'BWR': 1260,
+             'PWR': 1000,
+             'EPR': 1600,
+             'SMR': 50,
+             '12_SMR': 600
+             }
+_reactor_specs = {'AP1000': _ap1000_spec,
+                  #'PHWR': _phwr_spec,
+                  'BWR': _bwr_spec,
+                  #'CANDU': _candu_spec,
+                  'PWR': _pwr_spec,
+                  'EPR': _epr_spec,
+                  'SMR': _smr_spec}
+# assembly mass per MWe of the 1000MWe pwr linear core size model
+_default_kg_per_mwe = _pwr['u_mass'] / _pwr['thermal_power']
+
+
 class from_pris:
     def __init__(self, csv_file, init_date, duration,
                  country_list, assumed_lifetime=720,
@@ -49,10 +214,10 @@ class from_pris:
         self.reactor_data = self.read_csv()
 
         self.reactor_data['entry_time'] = self.get_entrytime(self.reactor_data['Commercial Date'])
-        self.reactor_data['lifetime'] = self.get_lifetime(list(self.reactor_data['entry_time']),
-                                                          list(self.reactor_data['Shutdown Date']))
+        self.reactor_data['lifetime'] = self.get_lifetime(self.reactor_data['entry_time'],
+                                                          self.reactor_data['Shutdown Date'])
         # edit entry time to have at least 1
-        self.reactor_data['entry_time'] = [max(1, q) for q in self.reactor_data['entry_time']]
+        self.reactor_data['entry_time'] = self.reactor_data['entry_time'].clip(lower=1)
 
         self.reactor_render()
         self.region_render()
@@ -66,33 +231,31 @@ class from_pris:
 
     def process_init_date(self, init_date):
         year, month, day = init_date//10000, init_date%10000//100, init_date%100
-        return pd.to_datetime(f'{year}/{month}/{day}')
+        return pd.Timestamp(year, month, day)
 
 
     def get_entrytime(self, reactor_start_date):
-        dt = [q - self.init_date for q in list(reactor_start_date)]
-        # in months
-        dt = [int(q.total_seconds() / (3600 * 24 * 30)) for q in dt]
-        return dt
+        # in months, truncated towards zero
+        return self.get_delta_month(self.init_date, reactor_start_date).astype(int)
 
 
     def get_delta_month(self, t0, t1):
         dt = t1 - t0
+        # works on a single timestamp or on a whole column
+        if isinstance(dt, pd.Series):
+            dt = dt.dt
         return dt.total_seconds() / (3600 * 24 * 30)
 
 
     def get_lifetime(self, entrytime, shutdown_date):
-        lifetime_list = []
-
-        for indx in range(len(entrytime)):
-            if str(shutdown_date[indx]) == 'NaT':
-                if entrytime[indx] < 0:
-                    lifetime_list.append(self.assumed_lifetime + entrytime[indx])
-                else:
-                    lifetime_list.append(self.assumed_lifetime)
-            else:
-                lifetime_list.append(self.get_delta_month(self.init_date, shutdown_date[indx]))
-        return lifetime_list
+        no_shutdown = shutdown_date.isna()
+        lifetime = np.where(no_shutdown,
+                            self.assumed_lifetime + np.minimum(entrytime, 0),
+                            self.get_delta_month(self.init_date, shutdown_date))
+        # lifetimes stay integers when no reactor has a shutdown date
+        if no_shutdown.all():
+            lifetime = lifetime.astype(int)
+        return lifetime
 
 
     def read_csv(self):
@@ -108,193 +271,132 @@ class from_pris:
         reactor_array:  list
             array with the data from csv file
         """
-        df = pd.read_csv(self.csv_file, skiprows=1)
+        # only parse the columns that are used downstream
+        df = pd.read_csv(self.csv_file, skiprows=1,
+                         usecols=['Country', 'Reactor Unit', 'Type',
+                                  'Net Capacity (MWe)', 'Status',
+                                  'Commercial Date', 'Shutdown Date',
+                                  'Latitude', 'Longitude'],
+                         dtype={'Country': 'category', 'Reactor Unit': str,
+                                'Type': 'category', 'Status': 'category'})
         # check if countries are valid
+        countries = df.Country.unique()
+        valid_countries = set(countries)
         for country in self.country_list:
-            if country not in df.Country.unique():
-                print(df.Country.unique())
+            if country not in valid_countries:
+                print(countries)
                 raise ValueError('Country not in list')
-        filtered_df = df[df['Country'].isin(self.country_list)]
-
-        # filter reactors that are not built
-        bad_status_list = ['Review Suspended', 'Suspended Constr.', 'Deferred', 'Cancelled Constr.',
-                           'Under Review', 'Under Construction']
-        filtered_df = filtered_df[~filtered_df['Status'].isin(bad_status_list)]
-
-        # filter reactors that are already gone
-        filtered_df = filtered_df[filtered_df['Status'] != 'Permanent Shutdown']
-
-        # filter reactors with less than 100MWe (research reactors)
-        filtered_df = filtered_df[filtered_df['Net Capacity (MWe)'] > 100]
+        # filter reactors that are not built, reactors that are already gone
+        # and reactors with less than 100MWe (research reactors)
+        # in a single boolean mask
+        mask = (df['Country'].isin(self.country_list) &
+                ~df['Status'].isin(_excluded_status) &
+                (df['Net Capacity (MWe)'] > 100))
+        filtered_df = df[mask].copy()
 
         # convert dates to datetime format
-        for column in ['First Criticality Date', 'First Grid Date',
-                       'Commercial Date', 'Shutdown Date']:
+        # (only the dates that entry time and lifetime are derived from)
+        for column in ['Commercial Date', 'Shutdown Date']:
             filtered_df[column] = pd.to_datetime(filtered_df[column])
 
         # refine name
-        filtered_df['Reactor Unit'] = [self.refine_name(q) for q in filtered_df['Reactor Unit']]
+        filtered_df['Reactor Unit'] = refine_names(filtered_df['Reactor Unit'])
 
         return filtered_df
 
 
     def read_template(self, template):
-        return jinja2.Template(template)
-
-    def refine_name(self, name):
-        name = name
-        start = name.find('(')
-        end = name.find(')')
-        if start != -1 and end != -1:
-            name = name[:start]
-        name = name.replace(r'&', 'and')
-        return name
-
-    def get_position_str(self, row):
-        longitude = row['Longitude']
-        latitude = row['Latitude']
-        if np.isnan(longitude): return ''
-        return '<latitude>%s</latitude><longitude>%s</longitude>' %(latitude, longitude)
+        return _compile_template(template)
 
 
     def reactor_render(self):
-        self.reactor_str = ''
-        template_dict = {}
-        for reactor in ['pwr', 'mox', 'candu', 'smr']:
-            template_dict[reactor] = getattr(template_collections, reactor+'_template')
-
+        reactor_parts = []
         if 'cyborg' in self.special:
-            for reactor in ['pwr', 'mox', 'candu']:
-                template_dict[reactor] = getattr(template_collections, reactor+'_template_cyborg')
+            template_dict = _cyborg_templates
+        else:
+            template_dict = _default_templates
 
         if 'f33' in self.special:
-            template_dict['pwr'] = getattr(template_collections, 'pwr_template_f33')
-
-        template_dict = {k:self.read_template(v) for k, v in template_dict.items()}
-
-        reactor_spec_data = get_data()
-        ap1000 = reactor_spec_data['ap1000']
-        bwr = reactor_spec_data['bwr']
-        pwr = reactor_spec_data['pwr']
-        # from NRC application
-        # assemblies per core is normalized by capcity
-        ap1000_spec = {'template': template_dict['pwr'],
-                       'kg_per_assembly': ap1000['u_mass']/(ap1000['elec_power']*ap1000['num_batch']) ,
-                       'assemblies_per_core': ap1000['num_batch'],
-                       'cycle_time': ap1000['cycle_length']/30,
-                       'refuel_time': 1,
-                       'assemblies_per_batch': 1}
-        bwr_spec = {'template': template_dict['pwr'],
-                    'kg_per_assembly': bwr['u_mass'] / (bwr['elec_power']*bwr['num_batch']),
-                    'assemblies_per_core': bwr['num_batch'],
-                    'cycle_time': bwr['cycle_length']/30,
-                    'refuel_time': 1,
-                    'assemblies_per_batch': 1}
-        pwr_spec = {'template': template_dict['pwr'],
-                    'kg_per_assembly': pwr['u_mass'] / (pwr['elec_power'] * pwr['num_batch']),
-                    'assemblies_per_core': pwr['num_batch'],
-                    'cycle_time': pwr['cycle_length']/30,
-                    'refuel_time': 1,
-                    'assemblies_per_batch': 1}
-
-        phwr_spec = {'template': template_dict['candu'],
-                     'kg_per_assembly': 8000 / 473,
-                     'assemblies_per_core': 473 / 500.0,
-                     'assemblies_per_batch': 60,
-                     'cycle_time': 1,
-                    'refuel_time': 0,}
-        candu_spec = {'template': template_dict['candu'],
-                      'kg_per_assembly': 8000 / 473,
-                      'assemblies_per_core': 473 / 500.0,
-                      'cycle_time': 1,
-                      'refuel_time': 0,
-                      'assemblies_per_batch': 60}
-        epr_spec = {'template': template_dict['pwr'],
-                    'kg_per_assembly': 467.0 * 216 / 4800,
-                    'cycle_time': 14,
-                    'refuel_time': 1,
-                    'assemblies_per_core': 3,
-                    'assemblies_per_batch': 1}
-        smr_spec = {'template': template_dict['smr'],
-                    'kg_per_assembly': 2997.12 / 50,
-                    'cycle_time': 12,
-                    'refuel_time': 1,
-                    'assemblies_per_core': 3,
-                    'assemblies_per_batch': 1}
-        pow_dict = {'AP1000': 1110,
-                    'BWR': 1260,
-                    'PWR': 1000,
-                    'EPR': 1600,
-                    'SMR': 50,
-                    '12_SMR': 600
-                    }
-        reactor_specs = {'AP1000': ap1000_spec,
-                         #'PHWR': phwr_spec,
-                         'BWR': bwr_spec,
-                         #'CANDU': candu_spec,
-                         'PWR': pwr_spec,
-                         'EPR': epr_spec,
-                         'SMR': smr_spec}
+            template_dict = dict(template_dict, pwr=template_collections.pwr_template_f33)
+
+        # render each template once per reactor type, leaving only the
+        # per-reactor values to be filled in with str.format, and keep the
+        # bound format method with the assembly mass of the type
+        renderers = {k: (_format_template(template_dict[v.template],
+                                          _reactor_fields,
+                                          type=k,
+                                          refuel_time=int(v.refuel_time),
+                                          cycle_time=int(v.cycle_time),
+                                          n_assem_core=v.assemblies_per_core,
+                                          n_assem_batch=v.assemblies_per_batch).format,
+                         v.kg_per_assembly)
+                     for k, v in _reactor_specs.items()}
+        # assume 1000MWe pwr linear core size model if no match
+        default_render = _format_template(template_dict['pwr'],
+                                          _reactor_fields + ('type',),
+                                          refuel_time=1,
+                                          cycle_time=14,
+                                          n_assem_core=3,
+                                          n_assem_batch=1).format
 
         print(f'Rendering {len(self.reactor_data)} reactors..')
-        for indx, row in self.reactor_data.iterrows():
-
-            name = row['Reactor Unit']
-            reactor_type = row['Type']
-            country = row['Country']
-            capacity = row['Net Capacity (MWe)']
-            position_str = self.get_position_str(row)
+        no_position = []
+        cols = self.reactor_data[['Reactor Unit', 'Type', 'Country',
+                                  'Net Capacity (MWe)', 'Latitude',
+                                  'Longitude']].to_numpy()
+        for name, reactor_type, country, capacity, latitude, longitude in cols:
+            if np.isnan(longitude):
+                position_str = ''
+            else:
+                position_str = f'<latitude>{latitude}</latitude><longitude>{longitude}</longitude>'
             if not position_str:
-                print(f'{name} does not have any position data - leaving it blank.')
-            if reactor_type in reactor_specs.keys():
+                no_position.append(f'{name} does not have any position data - leaving it blank.')
+            if reactor_type in renderers:
                 # if the reactor type matches with the pre-defined dictionary,
                 # use the specifications in the dictionary.
-                spec_dict = reactor_specs[reactor_type]
-                reactor_body = spec_dict['template'].render(
+                render, kg_per_assembly = renderers[reactor_type]
+                reactor_body = render(
                     country=country,
-                    type=reactor_type,
                     reactor_name=name,
-                    refuel_time=int(spec_dict['refuel_time']),
-                    cycle_time=int(spec_dict['cycle_time']),
-                    assem_size=round(spec_dict['kg_per_assembly'] * capacity, 3),
-                    n_assem_core=spec_dict['assemblies_per_core'],
-                    n_assem_batch=spec_dict['assemblies_per_batch'],
+                    assem_size=round(kg_per_assembly * capacity, 3),
                     capacity=capacity,
                     position_=position_str)
             else:
-                # assume 1000MWe pwr linear core size model if no match
-                reactor_body = template_dict['pwr'].render(
+                reactor_body = default_render(
                     country=country,
                     reactor_name=name,
                     type=reactor_type,
-                    assem_size=pwr['u_mass']/pwr['thermal_power'] * capacity,
-                    refuel_time=1,
-                    cycle_time=14,
-                    n_assem_core=3,
-                    n_assem_batch=1,
+                    assem_size=_default_kg_per_mwe * capacity,
                     capacity=capacity,
                     position_=position_str)
 
-            self.reactor_str += reactor_body + '\n'
+            reactor_parts.append(reactor_body + '\n')
+        # report the reactors without position data in one write
+        if no_position:
+            print('\n'.join(no_position))
 
         if not self.done_generic:
-            for key, val in pow_dict.items():
+            for key, val in _pow_dict.items():
                 k = key.replace('12_', '')
-                spec_dict = reactor_specs[k]
-                reactor_body = spec_dict['template'].render(
-                        country='Generic',
+                spec = _reactor_specs[k]
+                reactor_body = _format_template(
+                        template_dict[spec.template],
+                        _reactor_fields,
                         type=key,
+                        refuel_time=int(spec.refuel_time),
+                        cycle_time=int(spec.cycle_time),
+                        n_assem_core=spec.assemblies_per_core,
+                        n_assem_batch=spec.assemblies_per_batch).format(
+                        country='Generic',
                         reactor_name=key,
-                        refuel_time=int(spec_dict['refuel_time']),
-                        cycle_time=int(spec_dict['cycle_time']),
-                        assem_size=round(spec_dict['kg_per_assembly'] * val, 3),
-                        n_assem_core=spec_dict['assemblies_per_core'],
-                        n_assem_batch=spec_dict['assemblies_per_batch'],
+                        assem_size=round(spec.kg_per_assembly * val, 3),
                         capacity=val,
                         position_=position_str)
-                self.reactor_str += reactor_body + '\n'
+                reactor_parts.append(reactor_body + '\n')
             self.done_generic = True
 
+        self.reactor_str = ''.join(reactor_parts)
+
 
     def region_render(self):
         """Takes the list and template and writes a region file
@@ -311,52 +413,36 @@ class from_pris:
         The region section of cyclus input file
 
         """
-        template = self.read_template(template_collections.deployinst_template)
-        full_template = self.read_template(template_collections.region_output_template)
-        sd = {}
-        country_list = []
-        empty_country = []
-        valhead = '<val>'
-        valtail = '</val>'
-
-        country_set = self.reactor_data.Country.unique()
-
-        for country in country_set:
-            prototype = ''
-            entry_time = ''
-            n_build = ''
-            lifetime = ''
-            sd[country] = ''
-
-            # for every reactor data corresponding to a country, create a
-            # string with its region block
-            filtered_df = self.reactor_data[self.reactor_data['Country'] == country]
-            for indx, row in filtered_df.iterrows():
-                if row['lifetime'] <= 0:
-                    continue
-                prototype += valhead + row['Reactor Unit'] + valtail + '\n'
-                entry_time += valhead + str(row['entry_time']) + valtail + '\n'
-                n_build += valhead + '1' + valtail + '\n'
-                lifetime += valhead + str(row['lifetime']) + valtail + '\n'
-
-            render_temp = template.render(prototype=prototype,
-                                          start_time=entry_time,
-                                          number=n_build,
-                                          lifetime=lifetime)
-            if prototype != '':
-                sd[country] += render_temp
-            else:
-                empty_country.append(country)
-
-        country_set = [q for q in country_set if q not in empty_country]
-        full_str = ''
-        for country in country_set:
-            country_body = full_template.render(country=country,
+        deployinst_format = _format_template(template_collections.deployinst_template,
+                                             _deployinst_fields)
+        region_format = _format_template(template_collections.region_output_template,
+                                         _region_fields)
+        full_str = []
+
+        # group the reactors by country in a single pass, in the order the
+        # countries first appear, and for every country create a string
+        # with its region block
+        for country, filtered_df in self.reactor_data.groupby('Country', sort=False,
+                                                              observed=True):
+            # only reactors with a positive lifetime are deployed, and
+            # countries without any are left out
+            filtered_df = filtered_df[filtered_df['lifetime'] > 0]
+            if filtered_df.empty:
+                continue
+            prototype = ''.join('<val>' + filtered_df['Reactor Unit'] + '</val>\n')
+            entry_time = ''.join('<val>' + filtered_df['entry_time'].astype(str) + '</val>\n')
+            n_build = '<val>1</val>\n' * len(filtered_df)
+            lifetime = ''.join('<val>' + filtered_df['lifetime'].astype(str) + '</val>\n')
+            deployinst = deployinst_format.format(prototype=prototype,
+                                                  start_time=entry_time,
+                                                  number=n_build,
+                                                  lifetime=lifetime)
+            country_body = region_format.format(country=country,
                                                 country_gov=country+'_government',
-                                                deployinst=sd[country])
-            full_str += country_body + '\n'
+                                                deployinst=deployinst)
+            full_str.append(country_body + '\n')
 
-        self.region_str = full_str
+        self.region_str = ''.join(full_str)
 
 
     def input_render(self):
@@ -371,18 +457,20 @@ class from_pris:
         else:
             reprocessing_chunk = ''
 
-        rendered_template = template.render(duration=self.duration,
-                                            startmonth=startmonth,
-                                            startyear=startyear,
-                                            reprocessing=reprocessing_chunk,
-                                            reactor_input=self.reactor_str,
-                                            region_input=self.region_str)
         if 'f33' in self.special:
-            f33_str = '<spec><lib>f33_reactor.f33_reactor</lib><name>f33_reactor</name></spec></archetypes>'
-            rendered_template = rendered_template.replace('</archetypes>', f33_str)
+            f33_archetype = '<spec><lib>f33_reactor.f33_reactor</lib><name>f33_reactor</name></spec>'
+        else:
+            f33_archetype = ''
 
+        # write the rendered template to the file as it is generated
         with open(self.output_file, 'w') as output:
-            output.write(rendered_template)
+            template.stream(duration=self.duration,
+                            startmonth=startmonth,
+                            startyear=startyear,
+                            f33_archetype=f33_archetype,
+                            reprocessing=reprocessing_chunk,
+                            reactor_input=self.reactor_str,
+                            region_input=self.region_str).dump(output)
 
 
 
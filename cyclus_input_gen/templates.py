@@ -290,7 +290,7 @@ class template_collections:
       <lib>cycamore</lib>
       <name>Mixer</name>
     </spec>
-  </archetypes>
+  {{ f33_archetype }}</archetypes>
 
 
 <facility>
@@ -1,4 +1,6 @@
 import numpy as np
+import pandas as pd
+import pytest
 import collections
 import os
 import sys
@@ -73,8 +75,97 @@ def test_entrytime():
     assert fp.get_entrytime(init_date, start_date) == 446
 
 
-def test_refine_name():
-    """Test if name is refined correctly"""
-    string = 'Charles(Bukowski)'
-    string = string.encode('utf-8')
-    assert fp.refine_name(string) == 'Charles'
+def test_refine_names():
+    """Test if names are refined correctly"""
+    names = pd.Series(['A(B)', 'P&Q (R)', 'X(Y', 'A)B(C'])
+    assert list(fp.refine_names(names)) == ['A', 'PandQ ', 'X(Y', 'A)B']
+
+
+def test_format_template_fields():
+    """Test if _format_template fixes values and leaves format fields"""
+    fmt = fp._format_template('<a>{{ x }}</a><b>{{y}}</b>', ('y',), x=1)
+    assert fmt == '<a>1</a><b>{y}</b>'
+    assert fmt.format(y='two') == '<a>1</a><b>two</b>'
+
+
+def test_format_template_escapes_braces():
+    """Test if literal braces in a template survive str.format"""
+    fmt = fp._format_template('{ {{ x }} }{{ y }}', ('y',), x=1)
+    assert fmt.format(y=2) == '{ 1 }2'
+
+
+def test_format_template_rejects_non_plain_fields():
+    """Test if fields used in expressions or blocks are rejected"""
+    template = ('{% if position_ %}<p>{{ position_ }}</p>{% endif %}'
+                '<c>{{ capacity * 2 }}</c>')
+    with pytest.raises(ValueError):
+        fp._format_template(template, ('position_',), capacity=3)
+    with pytest.raises(ValueError):
+        fp._format_template(template, ('capacity',), position_='x')
+
+
+def test_format_template_rejects_missing_variables():
+    """Test if variables neither fixed nor fields are rejected"""
+    with pytest.raises(ValueError):
+        fp._format_template('{{ x }}{{ y }}', ('y',))
+
+
+def bare_from_pris(init_date=19700101, assumed_lifetime=720):
+    """Returns a from_pris instance without reading or rendering anything"""
+    instance = fp.from_pris.__new__(fp.from_pris)
+    instance.init_date = instance.process_init_date(init_date)
+    instance.assumed_lifetime = assumed_lifetime
+    return instance
+
+
+def test_delta_month_scalar_and_column():
+    """Test if get_delta_month takes single timestamps and columns"""
+    instance = bare_from_pris()
+    t1 = pd.Timestamp(1970, 1, 31)
+    assert instance.get_delta_month(instance.init_date, t1) == 1.0
+    column = instance.get_delta_month(instance.init_date, pd.Series([t1]))
+    assert list(column) == [1.0]
+
+
+def test_entrytime_column():
+    """Test if get_entrytime truncates months towards zero"""
+    instance = bare_from_pris()
+    start = pd.to_datetime(pd.Series(['1970-01-31', '1970-03-15', '1969-12-01']))
+    assert list(instance.get_entrytime(start)) == [1, 2, -1]
+
+
+def test_lifetime_no_shutdown_dates():
+    """Test if lifetimes stay integers when no reactor has a shutdown date,
+       and a negative entry time shortens the assumed lifetime"""
+    instance = bare_from_pris()
+    lifetime = instance.get_lifetime(pd.Series([10, -5]),
+                                     pd.Series([pd.NaT, pd.NaT]))
+    assert lifetime.dtype.kind == 'i'
+    assert list(lifetime) == [720, 715]
+
+
+def test_lifetime_mixed_shutdown_dates():
+    """Test if lifetimes are floats when some reactors have shutdown dates"""
+    instance = bare_from_pris()
+    lifetime = instance.get_lifetime(pd.Series([10, -5]),
+                                     pd.Series([pd.NaT, pd.Timestamp(1970, 3, 2)]))
+    assert lifetime.dtype.kind == 'f'
+    assert list(lifetime) == [720.0, 2.0]
+
+
+def test_region_render_country_order():
+    """Test if regions follow the first row of each country, and
+       countries without a positive lifetime are left out"""
+    instance = bare_from_pris()
+    countries = ['C', 'A', 'B', 'A', 'C']
+    instance.reactor_data = pd.DataFrame(
+        {'Country': pd.Categorical(countries, categories=['A', 'B', 'C']),
+         'Reactor Unit': ['c1', 'a1', 'b1', 'a2', 'c2'],
+         'entry_time': [1, 1, 1, 1, 1],
+         'lifetime': [-3.0, -2.0, 10.0, 12.0, 0.0]})
+    instance.region_render()
+    region_str = instance.region_str
+    assert '<name>C </name>' not in region_str
+    assert region_str.index('<name>A </name>') < region_str.index('<name>B </name>')
+    assert '<val>a1</val>' not in region_str
+    assert '<val>a2</val>' in region_str